@@ -1,7 +1,7 @@
 import sys
 import random
 import pygame
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, Iterator, List, Tuple, Optional, Dict
 
 # =========================
 # Configuration
@@ -10,6 +10,12 @@ WIDTH, HEIGHT = 640, 640
 ROWS, COLS = 8, 8
 SQ_SIZE = WIDTH // COLS
 FPS = 60
+# Window events after which the screen contents must be repainted
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT, pygame.WINDOWEXPOSED)
+
+# AI search limits
+AI_MAX_DEPTH = 4
+AI_TIME_BUDGET_MS = 1000
 
 # Colors
 LIGHT = (238, 238, 210)  # light squares
@@ -19,73 +25,266 @@ MOVE_HIGHLIGHT = (186, 202, 68)
 CHECK_HIGHLIGHT = (255, 80, 80)
 TEXT_COLOR = (30, 30, 30)
 
-WHITE = 'w'
-BLACK = 'b'
-
-# Piece types
-PAWN = 'P'
-ROOK = 'R'
-KNIGHT = 'N'
-BISHOP = 'B'
-QUEEN = 'Q'
-KING = 'K'
-
-Piece = Tuple[str, str]  # (color, type)
-Move = Tuple[Tuple[int, int], Tuple[int, int], Optional[str]]  # ((r1,c1),(r2,c2), promotion)
+# Colors (high bit of a square byte)
+WHITE = 0
+BLACK = 8
+COLOR_MASK = 8
+
+# Piece types (low bits of a square byte)
+EMPTY = 0
+PAWN = 1
+KNIGHT = 2
+BISHOP = 3
+ROOK = 4
+QUEEN = 5
+KING = 6
+TYPE_MASK = 7
+
+# Square bytes: color | type
+WP, WN, WB, WR, WQ, WK = 1, 2, 3, 4, 5, 6
+BP, BN, BB, BR, BQ, BK = 9, 10, 11, 12, 13, 14
+
+Piece = int  # color | type, EMPTY for no piece
+Board = bytearray  # 64 squares, indexed r * COLS + c
+Bitboards = List[int]  # bb[piece] per piece, bb[WHITE]/bb[BLACK] per side occupancy
+Move = int  # from_sq << 10 | to_sq << 4 | promotion type (EMPTY if none)
 
 # Unicode mapping for pieces
 UNICODE_PIECES: Dict[Piece, str] = {
-    (WHITE, KING):   '♔',
-    (WHITE, QUEEN):  '♕',
-    (WHITE, ROOK):   '♖',
-    (WHITE, BISHOP): '♗',
-    (WHITE, KNIGHT): '♘',
-    (WHITE, PAWN):   '♙',
-    (BLACK, KING):   '♚',
-    (BLACK, QUEEN):  '♛',
-    (BLACK, ROOK):   '♜',
-    (BLACK, BISHOP): '♝',
-    (BLACK, KNIGHT): '♞',
-    (BLACK, PAWN):   '♟',
+    WK: '♔',
+    WQ: '♕',
+    WR: '♖',
+    WB: '♗',
+    WN: '♘',
+    WP: '♙',
+    BK: '♚',
+    BQ: '♛',
+    BR: '♜',
+    BB: '♝',
+    BN: '♞',
+    BP: '♟',
 }
 
 # Fallback letters if font lacks glyphs
 LETTER_PIECES: Dict[Piece, str] = {
-    (WHITE, KING):   'K',
-    (WHITE, QUEEN):  'Q',
-    (WHITE, ROOK):   'R',
-    (WHITE, BISHOP): 'B',
-    (WHITE, KNIGHT): 'N',
-    (WHITE, PAWN):   'P',
-    (BLACK, KING):   'k',
-    (BLACK, QUEEN):  'q',
-    (BLACK, ROOK):   'r',
-    (BLACK, BISHOP): 'b',
-    (BLACK, KNIGHT): 'n',
-    (BLACK, PAWN):   'p',
+    WK: 'K',
+    WQ: 'Q',
+    WR: 'R',
+    WB: 'B',
+    WN: 'N',
+    WP: 'P',
+    BK: 'k',
+    BQ: 'q',
+    BR: 'r',
+    BB: 'b',
+    BN: 'n',
+    BP: 'p',
 }
 
-MATERIAL_VALUES = {PAWN: 1, KNIGHT: 3, BISHOP: 3, ROOK: 5, QUEEN: 9, KING: 0}
+MATERIAL_VALUES: Dict[int, int] = {PAWN: 1, KNIGHT: 3, BISHOP: 3, ROOK: 5, QUEEN: 9, KING: 0}
+
+# Search scores: mates are worth more than any material balance, sooner mates more still
+MATE_SCORE = 10000
+INFINITY = MATE_SCORE + 1000
+
+# Transposition table entry flags: the stored value is exact, or a lower/upper bound
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+TT_MAX_ENTRIES = 1 << 20
+# Scores beyond this are mates, stored in the table relative to the node instead of the root
+MATE_BOUND = MATE_SCORE - 1000
+
+# int.bit_count is Python 3.10+
+popcount: Callable[[int], int] = getattr(int, 'bit_count', lambda x: bin(x).count('1'))
+
+# =========================
+# Bitboard Tables
+# =========================
+# Square sq = r * COLS + c is bit (1 << sq); row 0 is Black's back rank.
+KNIGHT_DELTAS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+PAWN_CAPTURE_DELTAS: Dict[int, Tuple[Tuple[int, int], ...]] = {
+    WHITE: ((-1, -1), (-1, 1)),
+    BLACK: ((1, -1), (1, 1)),
+}
+
+# Ray directions
+N, S, W, E, NW, NE, SW, SE = range(8)
+RAY_DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+# Rays heading towards lower square indices meet their first blocker at the highest set bit
+RAY_DECREASING = (True, False, True, False, True, True, False, False)
+BISHOP_DIRS = (NW, NE, SW, SE)
+ROOK_DIRS = (N, S, W, E)
+QUEEN_DIRS = BISHOP_DIRS + ROOK_DIRS
+# Every ray direction tagged with whether it is diagonal (bishop/queen) or straight (rook/queen)
+ATTACK_DIRS = tuple((d, d in BISHOP_DIRS) for d in QUEEN_DIRS)
+
+
+def _build_step_table(deltas: Tuple[Tuple[int, int], ...]) -> Tuple[int, ...]:
+    table = []
+    for sq in range(ROWS * COLS):
+        r, c = divmod(sq, COLS)
+        mask = 0
+        for dr, dc in deltas:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < ROWS and 0 <= nc < COLS:
+                mask |= 1 << (nr * COLS + nc)
+        table.append(mask)
+    return tuple(table)
+
+
+def _build_ray_table(dr: int, dc: int) -> Tuple[int, ...]:
+    table = []
+    for sq in range(ROWS * COLS):
+        r, c = divmod(sq, COLS)
+        mask = 0
+        nr, nc = r + dr, c + dc
+        while 0 <= nr < ROWS and 0 <= nc < COLS:
+            mask |= 1 << (nr * COLS + nc)
+            nr += dr
+            nc += dc
+        table.append(mask)
+    return tuple(table)
+
+
+KNIGHT_ATTACKS = _build_step_table(KNIGHT_DELTAS)
+KING_ATTACKS = _build_step_table(KING_DELTAS)
+# Squares attacked by a pawn of the given color standing on sq
+PAWN_ATTACKS: Dict[int, Tuple[int, ...]] = {
+    WHITE: _build_step_table(PAWN_CAPTURE_DELTAS[WHITE]),
+    BLACK: _build_step_table(PAWN_CAPTURE_DELTAS[BLACK]),
+}
+RAYS = tuple(_build_ray_table(dr, dc) for dr, dc in RAY_DELTAS)
+# Shared (r, c) tuple per square, so emitted moves reuse them instead of allocating new ones
+SQUARE_COORDS: Tuple[Tuple[int, int], ...] = tuple(divmod(sq, COLS) for sq in range(ROWS * COLS))
+ALL_SQUARES = (1 << (ROWS * COLS)) - 1
+
+
+def bits(bb: int) -> Iterator[int]:
+    # Yield the index of each set bit, lowest first
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+def ray_attacks(sq: int, occ: int, dirs: Tuple[int, ...]) -> int:
+    attacks = 0
+    for d in dirs:
+        ray = RAYS[d][sq]
+        blockers = ray & occ
+        if blockers:
+            if RAY_DECREASING[d]:
+                first = blockers.bit_length() - 1
+            else:
+                first = (blockers & -blockers).bit_length() - 1
+            # Drop everything beyond the first blocker (the blocker itself stays attacked)
+            ray ^= RAYS[d][first]
+        attacks |= ray
+    return attacks
+
+
+def _build_line_tables(dirs: Tuple[int, int]) -> Tuple[Tuple[int, ...], Tuple[Dict[int, int], ...]]:
+    # Attacks along a line through sq only depend on the blockers inside it (the edge square
+    # never hides anything), so tabulate them per square for every such blocker subset
+    masks = []
+    tables = []
+    for sq in range(ROWS * COLS):
+        mask = 0
+        for d in dirs:
+            ray = RAYS[d][sq]
+            if ray:
+                edge = ray & -ray if RAY_DECREASING[d] else 1 << (ray.bit_length() - 1)
+                mask |= ray ^ edge
+        table: Dict[int, int] = {}
+        sub = 0
+        while True:
+            table[sub] = ray_attacks(sq, sub, dirs)
+            sub = (sub - mask) & mask  # next subset of mask
+            if not sub:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return tuple(masks), tuple(tables)
+
+
+# Zobrist keys per piece code and square (fixed seed, so hashes are reproducible)
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(_zobrist_rng.getrandbits(64) for _ in range(ROWS * COLS)) for _ in range(16)
+)
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)  # toggled on every move; set while Black is to move
+
+RANK_MASKS, RANK_ATTACKS = _build_line_tables((W, E))
+FILE_MASKS, FILE_ATTACKS = _build_line_tables((N, S))
+DIAG_MASKS, DIAG_ATTACKS = _build_line_tables((NW, SE))
+ANTI_MASKS, ANTI_ATTACKS = _build_line_tables((NE, SW))
+
+
+def bishop_attacks(sq: int, occ: int) -> int:
+    return DIAG_ATTACKS[sq][occ & DIAG_MASKS[sq]] | ANTI_ATTACKS[sq][occ & ANTI_MASKS[sq]]
+
+
+def rook_attacks(sq: int, occ: int) -> int:
+    return RANK_ATTACKS[sq][occ & RANK_MASKS[sq]] | FILE_ATTACKS[sq][occ & FILE_MASKS[sq]]
+
+
+def queen_attacks(sq: int, occ: int) -> int:
+    return bishop_attacks(sq, occ) | rook_attacks(sq, occ)
+
+
+# Slider attacks on an empty board: no enemy slider on these lines means no slider attack at all
+BISHOP_RAYS = tuple(bishop_attacks(sq, 0) for sq in range(ROWS * COLS))
+ROOK_RAYS = tuple(rook_attacks(sq, 0) for sq in range(ROWS * COLS))
 
 
 class ChessGame:
     def __init__(self):
         pygame.init()
-        pygame.display.set_caption('Pygame Chess - Human (White) vs Random AI (Black)')
+        pygame.display.set_caption('Pygame Chess - Human (White) vs AI (Black)')
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         self.clock = pygame.time.Clock()
 
         # Try loading a font that supports chess unicode; fallback to default
         self.font = self._load_font()
-
-        self.board: List[List[Optional[Piece]]] = self._create_start_position()
-        self.turn: str = WHITE
+        # quick heuristic: render a white king and check if width is non-trivial
+        self._use_unicode: bool = self.font.render(UNICODE_PIECES[WK], True, (10, 10, 10)).get_width() > SQ_SIZE // 3
+        self._status_font = pygame.font.SysFont(self.font.get_name() if hasattr(self.font, 'get_name') else None, 20)
+        # Last rendered status line, reused until the message changes
+        self._status_surface: Optional[Tuple[str, pygame.Surface]] = None
+        # Static artwork rendered once and blitted every redraw
+        self._piece_surfaces: Dict[Piece, pygame.Surface] = self._render_piece_surfaces()
+        self._board_bg: pygame.Surface = self._render_board_background()
+        self._move_highlight = self._render_highlight(MOVE_HIGHLIGHT)
+        self._check_highlight = self._render_highlight(CHECK_HIGHLIGHT)
+
+        self.board: Board = self._create_start_position()
+        self.bb: Bitboards = self._compute_bitboards(self.board)
+        # King squares, kept up to date by _do/_undo
+        self.king_sq: Dict[int, int] = {WHITE: self.board.find(WK), BLACK: self.board.find(BK)}
+        self.turn: int = WHITE
+        # Zobrist hash of the position, kept up to date by _do/_undo
+        self.hash: int = self._compute_hash()
         self.selected: Optional[Tuple[int, int]] = None
         self.legal_moves_from_selected: List[Move] = []
+        # (r, c) targets of the selected piece, decoded once for the move highlights
+        self._selected_targets: List[Tuple[int, int]] = []
         self.game_over: bool = False
         self.status_message: str = ''
-        self.ai_delay_ms = 400
-        self._ai_move_due_at: Optional[int] = None
+        self.ai_max_depth = AI_MAX_DEPTH
+        self.ai_time_budget_ms = AI_TIME_BUDGET_MS
+        # Search bookkeeping: node counter, deadline (pygame ticks) and whether time ran out
+        self._nodes: int = 0
+        self._deadline: int = 0
+        self._aborted: bool = False
+        # Transposition table: hash -> (depth, flag, value, best move)
+        self._tt: Dict[int, Tuple[int, int, int, Optional[Move]]] = {}
+        # Legal moves of the side to move grouped by source square; None until computed for this ply
+        self._legal_cache: Optional[Dict[int, List[Move]]] = None
+        self._in_check_cached: bool = False
+        # King square to highlight, set by _update_status_after_move while the side to move is in check
+        self._check_highlight_sq: Optional[Tuple[int, int]] = None
+        # Set whenever something visible changes; the main loop only redraws when set
+        self._dirty: bool = True
 
     def _load_font(self) -> pygame.font.Font:
         # Common fonts that include chess unicode on Windows/macOS/Linux
@@ -94,7 +293,7 @@ class ChessGame:
             try:
                 font = pygame.font.SysFont(name, SQ_SIZE - 10)
                 # Test render a white king glyph; if width is reasonable, accept
-                surf = font.render(UNICODE_PIECES[(WHITE, KING)], True, (0, 0, 0))
+                surf = font.render(UNICODE_PIECES[WK], True, (0, 0, 0))
                 if surf.get_width() > SQ_SIZE // 3:
                     return font
             except Exception:
@@ -102,244 +301,444 @@ class ChessGame:
         # Fallback to default font
         return pygame.font.SysFont(None, SQ_SIZE - 10)
 
-    def _create_start_position(self) -> List[List[Optional[Piece]]]:
-        board: List[List[Optional[Piece]]] = [[None for _ in range(COLS)] for _ in range(ROWS)]
+    def _render_piece_surfaces(self) -> Dict[Piece, pygame.Surface]:
+        glyphs = UNICODE_PIECES if self._use_unicode else LETTER_PIECES
+        surfaces: Dict[Piece, pygame.Surface] = {}
+        for p, char in glyphs.items():
+            # Choose piece color for text: black pieces darker
+            piece_color = (15, 15, 15) if (p & COLOR_MASK) == BLACK else (240, 240, 240)
+            text = self.font.render(char, True, piece_color)
+            rect = text.get_rect(center=(SQ_SIZE // 2, SQ_SIZE // 2))
+            # Add slight outline for contrast
+            outline = self.font.render(char, True, (0, 0, 0))
+            surf = pygame.Surface((SQ_SIZE, SQ_SIZE), pygame.SRCALPHA)
+            surf.blit(outline, outline.get_rect(center=rect.center).move(1, 1))
+            surf.blit(text, rect)
+            surfaces[p] = surf.convert_alpha()
+        return surfaces
+
+    def _render_board_background(self) -> pygame.Surface:
+        surf = pygame.Surface((WIDTH, HEIGHT))
+        for r in range(ROWS):
+            for c in range(COLS):
+                color = LIGHT if (r + c) % 2 == 0 else DARK
+                pygame.draw.rect(surf, color, (c * SQ_SIZE, r * SQ_SIZE, SQ_SIZE, SQ_SIZE))
+        return surf.convert()
+
+    def _render_highlight(self, color: Tuple[int, int, int]) -> pygame.Surface:
+        surf = pygame.Surface((SQ_SIZE, SQ_SIZE), pygame.SRCALPHA)
+        surf.fill((*color, 120))
+        return surf.convert_alpha()
+
+    def _create_start_position(self) -> Board:
+        board: Board = bytearray(ROWS * COLS)
         # Place pawns
         for c in range(COLS):
-            board[6][c] = (WHITE, PAWN)
-            board[1][c] = (BLACK, PAWN)
+            board[6 * COLS + c] = WP
+            board[1 * COLS + c] = BP
         # Place back rank
         back = [ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK]
         for c, pt in enumerate(back):
-            board[7][c] = (WHITE, pt)
-            board[0][c] = (BLACK, pt)
+            board[7 * COLS + c] = WHITE | pt
+            board[0 * COLS + c] = BLACK | pt
         return board
 
     # =========================
     # Utility & Board Helpers
     # =========================
-    def in_bounds(self, r: int, c: int) -> bool:
-        return 0 <= r < ROWS and 0 <= c < COLS
-
-    def clone_board(self) -> List[List[Optional[Piece]]]:
-        return [row.copy() for row in self.board]
-
-    def find_king(self, color: str, board: Optional[List[List[Optional[Piece]]]] = None) -> Tuple[int, int]:
-        b = board if board is not None else self.board
-        for r in range(ROWS):
-            for c in range(COLS):
-                p = b[r][c]
-                if p is not None and p[0] == color and p[1] == KING:
-                    return (r, c)
-        return (-1, -1)
+    def clone_board(self) -> Board:
+        return self.board[:]
+
+    def _compute_bitboards(self, b: Board) -> Bitboards:
+        bb: Bitboards = [0] * 16
+        for sq, p in enumerate(b):
+            if p:
+                bb[p] |= 1 << sq
+                bb[p & COLOR_MASK] |= 1 << sq
+        return bb
+
+    def _compute_hash(self) -> int:
+        h = ZOBRIST_SIDE if self.turn == BLACK else 0
+        for sq, p in enumerate(self.board):
+            if p:
+                h ^= ZOBRIST[p][sq]
+        return h
+
+    def find_king(self, color: int, board: Optional[Board] = None) -> Tuple[int, int]:
+        if board is None:
+            return SQUARE_COORDS[self.king_sq[color]]
+        sq = board.find(KING | color)
+        if sq == -1:
+            return (-1, -1)
+        return SQUARE_COORDS[sq]
 
     # =========================
     # Move Generation (Pseudo-legal)
     # =========================
-    def generate_pseudo_legal_moves(self, color: str, board: Optional[List[List[Optional[Piece]]]] = None) -> List[Move]:
-        b = board if board is not None else self.board
+    def generate_pseudo_legal_moves(self, color: int, board: Optional[Board] = None) -> List[Move]:
+        bb = self._compute_bitboards(board) if board is not None else self.bb
         moves: List[Move] = []
-        for r in range(ROWS):
-            for c in range(COLS):
-                p = b[r][c]
-                if p is None or p[0] != color:
-                    continue
-                pt = p[1]
-                if pt == PAWN:
-                    moves.extend(self._pawn_moves(r, c, color, b))
-                elif pt == KNIGHT:
-                    moves.extend(self._knight_moves(r, c, color, b))
-                elif pt == BISHOP:
-                    moves.extend(self._sliding_moves(r, c, color, b, [(-1, -1), (-1, 1), (1, -1), (1, 1)]))
-                elif pt == ROOK:
-                    moves.extend(self._sliding_moves(r, c, color, b, [(-1, 0), (1, 0), (0, -1), (0, 1)]))
-                elif pt == QUEEN:
-                    moves.extend(self._sliding_moves(r, c, color, b, [(-1, -1), (-1, 1), (1, -1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1)]))
-                elif pt == KING:
-                    moves.extend(self._king_moves(r, c, color, b))
+        # Locals for everything used per piece
+        add_targets = self._add_targets
+        pawn_moves = self._pawn_moves
+        knight_attacks = KNIGHT_ATTACKS
+        occ = bb[WHITE] | bb[BLACK]
+        not_own = ~bb[color]
+        for sq in bits(bb[color | PAWN]):
+            pawn_moves(sq, color, bb, moves)
+        for sq in bits(bb[color | KNIGHT]):
+            add_targets(sq, knight_attacks[sq] & not_own, moves)
+        for sq in bits(bb[color | BISHOP]):
+            add_targets(sq, bishop_attacks(sq, occ) & not_own, moves)
+        for sq in bits(bb[color | ROOK]):
+            add_targets(sq, rook_attacks(sq, occ) & not_own, moves)
+        for sq in bits(bb[color | QUEEN]):
+            add_targets(sq, queen_attacks(sq, occ) & not_own, moves)
+        # Note: Castling omitted for simplicity
+        for sq in bits(bb[color | KING]):
+            add_targets(sq, KING_ATTACKS[sq] & not_own, moves)
         return moves
 
-    def _pawn_moves(self, r: int, c: int, color: str, b: List[List[Optional[Piece]]]) -> List[Move]:
-        moves: List[Move] = []
-        dir = -1 if color == WHITE else 1
+    # Per-piece helpers append straight into the caller's move list
+    def _add_targets(self, sq: int, targets: int, out: List[Move]):
+        append = out.append
+        base = sq << 10
+        for to in bits(targets):
+            append(base | to << 4)
+
+    def _pawn_moves(self, sq: int, color: int, bb: Bitboards, out: List[Move]):
+        append = out.append
+        opp = WHITE if color == BLACK else BLACK
+        occ = bb[WHITE] | bb[BLACK]
+        step = -COLS if color == WHITE else COLS
         start_row = 6 if color == WHITE else 1
-        next_r = r + dir
-        # Forward move
-        if self.in_bounds(next_r, c) and b[next_r][c] is None:
-            # Promotion
-            if next_r == 0 or next_r == 7:
-                moves.append(((r, c), (next_r, c), QUEEN))
-            else:
-                moves.append(((r, c), (next_r, c), None))
+        base = sq << 10
+        next_sq = sq + step
+        next_r = next_sq // COLS
+        promo = QUEEN if next_r == 0 or next_r == 7 else EMPTY
+        # Forward move (pawns never stand on the last rank, so next_sq is on the board)
+        if not (occ >> next_sq) & 1:
+            append(base | next_sq << 4 | promo)
             # Double move from start
-            if r == start_row:
-                jump_r = r + 2 * dir
-                if self.in_bounds(jump_r, c) and b[jump_r][c] is None:
-                    moves.append(((r, c), (jump_r, c), None))
+            jump_sq = next_sq + step
+            if sq // COLS == start_row and not (occ >> jump_sq) & 1:
+                append(base | jump_sq << 4)
         # Captures
-        for dc in (-1, 1):
-            nc = c + dc
-            if self.in_bounds(next_r, nc) and b[next_r][nc] is not None and b[next_r][nc][0] != color:
-                if next_r == 0 or next_r == 7:
-                    moves.append(((r, c), (next_r, nc), QUEEN))
-                else:
-                    moves.append(((r, c), (next_r, nc), None))
+        for to in bits(PAWN_ATTACKS[color][sq] & bb[opp]):
+            append(base | to << 4 | promo)
         # Note: En passant omitted for simplicity
-        return moves
-
-    def _knight_moves(self, r: int, c: int, color: str, b: List[List[Optional[Piece]]]) -> List[Move]:
-        moves: List[Move] = []
-        for dr, dc in [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]:
-            nr, nc = r + dr, c + dc
-            if not self.in_bounds(nr, nc):
-                continue
-            if b[nr][nc] is None or b[nr][nc][0] != color:
-                moves.append(((r, c), (nr, nc), None))
-        return moves
-
-    def _sliding_moves(self, r: int, c: int, color: str, b: List[List[Optional[Piece]]], directions: List[Tuple[int, int]]) -> List[Move]:
-        moves: List[Move] = []
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            while self.in_bounds(nr, nc):
-                if b[nr][nc] is None:
-                    moves.append(((r, c), (nr, nc), None))
-                else:
-                    if b[nr][nc][0] != color:
-                        moves.append(((r, c), (nr, nc), None))
-                    break
-                nr += dr
-                nc += dc
-        return moves
-
-    def _king_moves(self, r: int, c: int, color: str, b: List[List[Optional[Piece]]]) -> List[Move]:
-        moves: List[Move] = []
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = r + dr, c + dc
-                if not self.in_bounds(nr, nc):
-                    continue
-                if b[nr][nc] is None or b[nr][nc][0] != color:
-                    moves.append(((r, c), (nr, nc), None))
-        # Note: Castling omitted for simplicity
-        return moves
 
     # =========================
     # Check / Legal Move Filtering
     # =========================
-    def is_square_attacked(self, r: int, c: int, by_color: str, board: Optional[List[List[Optional[Piece]]]] = None) -> bool:
-        b = board if board is not None else self.board
+    def is_square_attacked(self, sq: int, by_color: int, bb: Optional[Bitboards] = None) -> bool:
+        bb = bb if bb is not None else self.bb
         opp = by_color
         me = WHITE if opp == BLACK else BLACK
 
-        # 1) Pawn attacks
-        pawn_dir = -1 if opp == WHITE else 1
-        for dc in (-1, 1):
-            pr, pc = r - pawn_dir, c + dc  # reverse from attackers' perspective
-            if self.in_bounds(pr, pc):
-                p = b[pr][pc]
-                if p is not None and p[0] == opp and p[1] == PAWN:
-                    return True
+        # 1) Pawn attacks: a pawn of ours on sq would attack exactly the enemy pawns attacking sq
+        if PAWN_ATTACKS[me][sq] & bb[opp | PAWN]:
+            return True
 
         # 2) Knight attacks
-        for dr, dc in [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]:
-            nr, nc = r + dr, c + dc
-            if self.in_bounds(nr, nc):
-                p = b[nr][nc]
-                if p is not None and p[0] == opp and p[1] == KNIGHT:
-                    return True
+        if KNIGHT_ATTACKS[sq] & bb[opp | KNIGHT]:
+            return True
 
         # 3) King attacks (adjacent squares)
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = r + dr, c + dc
-                if self.in_bounds(nr, nc):
-                    p = b[nr][nc]
-                    if p is not None and p[0] == opp and p[1] == KING:
-                        return True
-
-        # 4) Sliding pieces: bishops/rooks/queens
-        # Bishop/Queen diagonals
-        for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            nr, nc = r + dr, c + dc
-            while self.in_bounds(nr, nc):
-                p = b[nr][nc]
-                if p is not None:
-                    if p[0] == opp and (p[1] == BISHOP or p[1] == QUEEN):
-                        return True
-                    break
-                nr += dr
-                nc += dc
-        # Rook/Queen orthogonals
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nr, nc = r + dr, c + dc
-            while self.in_bounds(nr, nc):
-                p = b[nr][nc]
-                if p is not None:
-                    if p[0] == opp and (p[1] == ROOK or p[1] == QUEEN):
-                        return True
-                    break
-                nr += dr
-                nc += dc
-
-        return False
-
-    def in_check(self, color: str, board: Optional[List[List[Optional[Piece]]]] = None) -> bool:
-        b = board if board is not None else self.board
-        kr, kc = self.find_king(color, b)
-        if kr == -1:
-            return False
+        if KING_ATTACKS[sq] & bb[opp | KING]:
+            return True
+
+        # 4) Sliding pieces: bishops/rooks/queens, only looked up when one shares a line with sq
+        occ = bb[WHITE] | bb[BLACK]
+        queens = bb[opp | QUEEN]
+        diagonal = bb[opp | BISHOP] | queens
+        if BISHOP_RAYS[sq] & diagonal and bishop_attacks(sq, occ) & diagonal:
+            return True
+        straight = bb[opp | ROOK] | queens
+        return bool(ROOK_RAYS[sq] & straight and rook_attacks(sq, occ) & straight)
+
+    def in_check(self, color: int, bb: Optional[Bitboards] = None) -> bool:
         opp = WHITE if color == BLACK else BLACK
-        return self.is_square_attacked(kr, kc, opp, b)
-
-    def make_move_on_board(self, b: List[List[Optional[Piece]]], move: Move) -> List[List[Optional[Piece]]]:
-        newb = [row.copy() for row in b]
-        (r1, c1), (r2, c2), promo = move
-        piece = newb[r1][c1]
-        newb[r1][c1] = None
-        if piece is None:
+        if bb is None:
+            return self.is_square_attacked(self.king_sq[color], opp)
+        king = bb[KING | color]
+        if not king:
+            return False
+        return self.is_square_attacked(king.bit_length() - 1, opp, bb)
+
+    def make_move_on_board(self, b: Board, move: Move) -> Board:
+        newb = b[:]
+        fr, to, promo = move >> 10, (move >> 4) & 0x3F, move & 0xF
+        piece = newb[fr]
+        newb[fr] = EMPTY
+        if not piece:
             return newb
-        color, pt = piece
         # Promotion handling for pawns
-        if promo is not None:
-            newb[r2][c2] = (color, promo)
+        if promo:
+            newb[to] = (piece & COLOR_MASK) | promo
         else:
-            newb[r2][c2] = (color, pt)
+            newb[to] = piece
         return newb
 
-    def generate_legal_moves(self, color: str) -> List[Move]:
+    def _toggle_bits(self, fr: int, to: int, piece: Piece, placed: Piece, captured: Piece):
+        # XOR toggling: applying the same update twice restores the bitboards and hash
+        bb = self.bb
+        from_bit = 1 << fr
+        to_bit = 1 << to
+        bb[piece] ^= from_bit
+        bb[placed] ^= to_bit
+        bb[piece & COLOR_MASK] ^= from_bit | to_bit
+        h = self.hash ^ ZOBRIST[piece][fr] ^ ZOBRIST[placed][to] ^ ZOBRIST_SIDE
+        if captured:
+            bb[captured] ^= to_bit
+            bb[captured & COLOR_MASK] ^= to_bit
+            h ^= ZOBRIST[captured][to]
+        self.hash = h
+
+    def _do(self, move: Move) -> Tuple[Piece, Piece]:
+        # Apply move in place; returns (captured, from_piece) for _undo
+        fr, to, promo = move >> 10, (move >> 4) & 0x3F, move & 0xF
+        b = self.board
+        piece = b[fr]
+        captured = b[to]
+        placed = (piece & COLOR_MASK) | promo if promo else piece
+        b[fr] = EMPTY
+        b[to] = placed
+        self._toggle_bits(fr, to, piece, placed, captured)
+        if (piece & TYPE_MASK) == KING:
+            self.king_sq[piece & COLOR_MASK] = to
+        return captured, piece
+
+    def _undo(self, move: Move, captured: Piece, piece: Piece):
+        fr, to = move >> 10, (move >> 4) & 0x3F
+        b = self.board
+        placed = b[to]
+        b[fr] = piece
+        b[to] = captured
+        self._toggle_bits(fr, to, piece, placed, captured)
+        if (piece & TYPE_MASK) == KING:
+            self.king_sq[piece & COLOR_MASK] = fr
+
+    def _compute_pins_and_checkers(self, color: int) -> Tuple[int, int, int]:
+        # Returns (pinned, checkers, check_ray): own pieces pinned to the king, enemy pieces
+        # giving check, and the squares between a sliding checker and the king
+        bb = self.bb
+        opp = WHITE if color == BLACK else BLACK
+        ksq = self.king_sq[color]
+        occ = bb[WHITE] | bb[BLACK]
+        own = bb[color]
+        diagonal = bb[opp | BISHOP] | bb[opp | QUEEN]
+        straight = bb[opp | ROOK] | bb[opp | QUEEN]
+        pinned = 0
+        checkers = (KNIGHT_ATTACKS[ksq] & bb[opp | KNIGHT]) | (PAWN_ATTACKS[color][ksq] & bb[opp | PAWN])
+        check_ray = 0
+        rays = RAYS
+        ray_decreasing = RAY_DECREASING
+        for d, is_diagonal in ATTACK_DIRS:
+            ray = rays[d][ksq]
+            sliders = diagonal if is_diagonal else straight
+            # Without an enemy slider on the ray there is neither a pin nor a check along it
+            if not ray & sliders:
+                continue
+            blockers = ray & occ
+            decreasing = ray_decreasing[d]
+            first = blockers.bit_length() - 1 if decreasing else (blockers & -blockers).bit_length() - 1
+            first_bit = 1 << first
+            if first_bit & own:
+                # Look past our piece for an enemy slider on the same line
+                rest = rays[d][first] & occ
+                if rest:
+                    second = rest.bit_length() - 1 if decreasing else (rest & -rest).bit_length() - 1
+                    if (1 << second) & sliders:
+                        pinned |= first_bit
+            elif first_bit & sliders:
+                checkers |= first_bit
+                check_ray |= ray ^ rays[d][first] ^ first_bit
+        return pinned, checkers, check_ray
+
+    def generate_legal_moves(self, color: int) -> List[Move]:
         legal: List[Move] = []
+        ksq = self.king_sq[color]
+        pinned, checkers, check_ray = self._compute_pins_and_checkers(color)
+        # Squares a non-king, unpinned piece may move to without leaving the king in check
+        if not checkers:
+            allowed = ALL_SQUARES
+        elif checkers & (checkers - 1):
+            allowed = 0  # double check: only the king can move
+        else:
+            allowed = checkers | check_ray
+        append = legal.append
+        do, undo, in_check = self._do, self._undo, self.in_check
         for move in self.generate_pseudo_legal_moves(color):
-            newb = self.make_move_on_board(self.board, move)
-            if not self.in_check(color, newb):
-                legal.append(move)
+            fr = move >> 10
+            if fr != ksq and not (pinned >> fr) & 1:
+                if (allowed >> ((move >> 4) & 0x3F)) & 1:
+                    append(move)
+                continue
+            # King moves and pinned pieces need the full test
+            captured, piece = do(move)
+            ok = not in_check(color)
+            undo(move, captured, piece)
+            if ok:
+                append(move)
         return legal
 
+    def _get_legal(self) -> Dict[int, List[Move]]:
+        if self._legal_cache is None:
+            cache: Dict[int, List[Move]] = {}
+            for move in self.generate_legal_moves(self.turn):
+                cache.setdefault(move >> 10, []).append(move)
+            self._legal_cache = cache
+            self._in_check_cached = self.in_check(self.turn)
+        return self._legal_cache
+
+    def _apply_move(self, move: Move):
+        # Play a move for the side to move and hand the turn over
+        self._do(move)
+        self.turn = WHITE if self.turn == BLACK else BLACK
+        self._legal_cache = None
+        self._dirty = True
+
     # =========================
-    # AI (Random Mover with capture preference)
+    # AI (Alpha-beta search)
     # =========================
     def ai_choose_move(self) -> Optional[Move]:
-        moves = self.generate_legal_moves(BLACK)
-        if not moves:
+        legal = self._get_legal()
+        if not legal:
             return None
-        # Prefer captures by estimated material gain; otherwise random
-        scored: List[Tuple[int, Move]] = []
+        moves = [mv for from_moves in legal.values() for mv in from_moves]
+        self._order_moves(moves)
+        self._nodes = 0
+        self._aborted = False
+        if len(self._tt) > TT_MAX_ENTRIES:
+            self._tt.clear()
+        self._deadline = pygame.time.get_ticks() + self.ai_time_budget_ms
+        best = moves[0]
+        # Iterative deepening: each finished depth seeds the move order of the next one,
+        # and an unfinished depth is thrown away when the time budget runs out
+        for depth in range(1, self.ai_max_depth + 1):
+            pick, score = self._search_root(moves, depth)
+            if self._aborted:
+                break
+            best = pick
+            moves.remove(pick)
+            moves.insert(0, pick)
+            if abs(score) >= MATE_SCORE - self.ai_max_depth:
+                break
+        return best
+
+    def _search_root(self, moves: List[Move], depth: int) -> Tuple[Move, int]:
+        color = self.turn
+        opp = WHITE if color == BLACK else BLACK
+        best_score = -INFINITY
+        pick = moves[0]
+        count = 0
+        for mv in moves:
+            captured, piece = self._do(mv)
+            # Searching with alpha one below the best score keeps equal moves exact,
+            # so ties can be broken at random (reservoir sampling, uniform among the best)
+            score = -self._negamax(depth - 1, -INFINITY, 1 - best_score, opp, 1)
+            self._undo(mv, captured, piece)
+            if self._aborted:
+                break
+            if score > best_score:
+                best_score, pick, count = score, mv, 1
+            elif score == best_score:
+                count += 1
+                if random.random() * count < 1:
+                    pick = mv
+        return pick, best_score
+
+    def _negamax(self, depth: int, alpha: int, beta: int, color: int, ply: int) -> int:
+        self._nodes += 1
+        if not self._nodes & 1023 and pygame.time.get_ticks() >= self._deadline:
+            self._aborted = True
+        if self._aborted:
+            return 0
+        if depth == 0:
+            return self._evaluate(color)
+
+        key = self.hash
+        entry = self._tt.get(key)
+        tt_move: Optional[Move] = None
+        if entry is not None:
+            entry_depth, flag, value, tt_move = entry
+            if entry_depth >= depth:
+                # Mate scores are stored relative to the node that found them
+                if value > MATE_BOUND:
+                    value -= ply
+                elif value < -MATE_BOUND:
+                    value += ply
+                if flag == TT_EXACT:
+                    return value
+                if flag == TT_LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value
+
+        moves = self.generate_legal_moves(color)
+        if not moves:
+            return -(MATE_SCORE - ply) if self.in_check(color) else 0
+        self._order_moves(moves)
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        opp = WHITE if color == BLACK else BLACK
+        alpha_orig = alpha
+        best = -INFINITY
+        best_move = moves[0]
+        do, undo, negamax = self._do, self._undo, self._negamax
         for mv in moves:
-            (r1, c1), (r2, c2), promo = mv
-            target = self.board[r2][c2]
-            gain = 0
-            if target is not None:
-                gain = MATERIAL_VALUES[target[1]]
-            # Tiny random to diversify
-            scored.append((gain, mv))
-        # Choose best gain; if tie, random among them
-        best_gain = max(s for s, _ in scored)
-        best_moves = [mv for s, mv in scored if s == best_gain]
-        return random.choice(best_moves)
+            captured, piece = do(mv)
+            score = -negamax(depth - 1, -beta, -alpha, opp, ply + 1)
+            undo(mv, captured, piece)
+            if score > best:
+                best = score
+                best_move = mv
+                if score > alpha:
+                    alpha = score
+                    if beta <= alpha:
+                        break
+
+        if not self._aborted and (entry is None or depth >= entry[0]):
+            if best <= alpha_orig:
+                flag = TT_UPPER
+            elif best >= beta:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            stored = best
+            if stored > MATE_BOUND:
+                stored += ply
+            elif stored < -MATE_BOUND:
+                stored -= ply
+            self._tt[key] = (depth, flag, stored, best_move)
+        return best
+
+    def _order_moves(self, moves: List[Move]):
+        # MVV-LVA: most valuable victim first, cheapest attacker breaking ties; quiet moves last
+        b = self.board
+        values = MATERIAL_VALUES
+        type_mask = TYPE_MASK
+
+        def mvv_lva(mv: Move) -> int:
+            victim = b[(mv >> 4) & 0x3F]
+            attacker = values[b[mv >> 10] & type_mask]
+            if not victim:
+                return -attacker
+            return values[victim & type_mask] * 10 - attacker
+
+        moves.sort(key=mvv_lva, reverse=True)
+
+    def _evaluate(self, color: int) -> int:
+        # Material balance from color's point of view
+        bb = self.bb
+        score = 0
+        for pt in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN):
+            score += MATERIAL_VALUES[pt] * (popcount(bb[WHITE | pt]) - popcount(bb[BLACK | pt]))
+        return score if color == WHITE else -score
 
     # =========================
     # Input Handling
@@ -349,45 +748,48 @@ class ChessGame:
             return
         x, y = pos
         c, r = x // SQ_SIZE, y // SQ_SIZE
-        if not self.in_bounds(r, c):
+        if not (0 <= r < ROWS and 0 <= c < COLS):
             return
-        clicked_piece = self.board[r][c]
+        self._dirty = True
+        clicked_piece = self.board[r * COLS + c]
         if self.selected is None:
             # Select a white piece
-            if clicked_piece is not None and clicked_piece[0] == WHITE:
-                self.selected = (r, c)
-                self.legal_moves_from_selected = [m for m in self.generate_legal_moves(WHITE) if m[0] == (r, c)]
+            if clicked_piece and (clicked_piece & COLOR_MASK) == WHITE:
+                self._select((r, c))
         else:
             # Attempt to move if clicked square is a legal target
+            sq = r * COLS + c
             for mv in self.legal_moves_from_selected:
-                (_, _), (tr, tc), _ = mv
-                if tr == r and tc == c:
-                    # Make the move
-                    self.board = self.make_move_on_board(self.board, mv)
-                    self.selected = None
-                    self.legal_moves_from_selected = []
-                    # Switch turn
-                    self.turn = BLACK
+                if (mv >> 4) & 0x3F == sq:
+                    # Make the move and switch turn
+                    self._apply_move(mv)
+                    self._select(None)
                     # Check end state after player's move
                     self._update_status_after_move()
-                    if not self.game_over:
-                        # Schedule AI move after delay
-                        self._ai_move_due_at = pygame.time.get_ticks() + self.ai_delay_ms
                     return
             # If not a legal move, either reselect or clear selection
-            if clicked_piece is not None and clicked_piece[0] == WHITE:
-                self.selected = (r, c)
-                self.legal_moves_from_selected = [m for m in self.generate_legal_moves(WHITE) if m[0] == (r, c)]
+            if clicked_piece and (clicked_piece & COLOR_MASK) == WHITE:
+                self._select((r, c))
             else:
-                self.selected = None
-                self.legal_moves_from_selected = []
+                self._select(None)
+
+    def _select(self, square: Optional[Tuple[int, int]]):
+        self.selected = square
+        if square is None:
+            self.legal_moves_from_selected = []
+        else:
+            r, c = square
+            self.legal_moves_from_selected = self._get_legal().get(r * COLS + c, [])
+        self._selected_targets = [SQUARE_COORDS[(mv >> 4) & 0x3F] for mv in self.legal_moves_from_selected]
 
     def _update_status_after_move(self):
         # Check opponent's state
         opp = WHITE if self.turn == BLACK else BLACK
-        legal = self.generate_legal_moves(self.turn)
+        self._dirty = True
+        legal = self._get_legal()
+        self._check_highlight_sq = self.find_king(self.turn) if self._in_check_cached else None
         if not legal:
-            if self.in_check(self.turn):
+            if self._in_check_cached:
                 self.game_over = True
                 self.status_message = 'Checkmate! {} wins.'.format('White' if opp == WHITE else 'Black')
             else:
@@ -395,7 +797,7 @@ class ChessGame:
                 self.status_message = 'Stalemate! Draw.'
         else:
             # Update check info
-            if self.in_check(self.turn):
+            if self._in_check_cached:
                 self.status_message = '{} to move: Check!'.format('White' if self.turn == WHITE else 'Black')
             else:
                 self.status_message = '{} to move.'.format('White' if self.turn == WHITE else 'Black')
@@ -404,10 +806,7 @@ class ChessGame:
     # Rendering
     # =========================
     def draw_board(self):
-        for r in range(ROWS):
-            for c in range(COLS):
-                color = LIGHT if (r + c) % 2 == 0 else DARK
-                pygame.draw.rect(self.screen, color, (c * SQ_SIZE, r * SQ_SIZE, SQ_SIZE, SQ_SIZE))
+        self.screen.blit(self._board_bg, (0, 0))
 
         # Highlight selected square
         if self.selected is not None:
@@ -415,52 +814,27 @@ class ChessGame:
             pygame.draw.rect(self.screen, SELECT_COLOR, (c * SQ_SIZE, r * SQ_SIZE, SQ_SIZE, SQ_SIZE))
 
         # Highlight legal moves from selected
-        for mv in self.legal_moves_from_selected:
-            (_, _), (tr, tc), _ = mv
-            surf = pygame.Surface((SQ_SIZE, SQ_SIZE), pygame.SRCALPHA)
-            surf.fill((*MOVE_HIGHLIGHT, 120))
-            self.screen.blit(surf, (tc * SQ_SIZE, tr * SQ_SIZE))
+        for tr, tc in self._selected_targets:
+            self.screen.blit(self._move_highlight, (tc * SQ_SIZE, tr * SQ_SIZE))
 
         # Highlight king in check
-        if self.in_check(self.turn):
-            kr, kc = self.find_king(self.turn)
-            surf = pygame.Surface((SQ_SIZE, SQ_SIZE), pygame.SRCALPHA)
-            surf.fill((*CHECK_HIGHLIGHT, 120))
-            self.screen.blit(surf, (kc * SQ_SIZE, kr * SQ_SIZE))
+        if self._check_highlight_sq is not None:
+            kr, kc = self._check_highlight_sq
+            self.screen.blit(self._check_highlight, (kc * SQ_SIZE, kr * SQ_SIZE))
 
     def draw_pieces(self):
-        use_unicode = True
-        # quick heuristic: render a white king and check if width is non-trivial
-        test = self.font.render(UNICODE_PIECES[(WHITE, KING)], True, (10, 10, 10))
-        if test.get_width() <= SQ_SIZE // 3:
-            use_unicode = False
-
-        for r in range(ROWS):
-            for c in range(COLS):
-                p = self.board[r][c]
-                if p is None:
-                    continue
-                color, pt = p
-                if use_unicode:
-                    char = UNICODE_PIECES[p]
-                else:
-                    char = LETTER_PIECES[p]
-                # Choose piece color for text: black pieces darker
-                piece_color = (15, 15, 15) if color == BLACK else (240, 240, 240)
-                text = self.font.render(char, True, piece_color)
-                rect = text.get_rect(center=(c * SQ_SIZE + SQ_SIZE // 2, r * SQ_SIZE + SQ_SIZE // 2))
-                # Add slight outline for contrast
-                outline = self.font.render(char, True, (0, 0, 0))
-                outline_rect = outline.get_rect(center=rect.center)
-                self.screen.blit(outline, outline_rect.move(1, 1))
-                self.screen.blit(text, rect)
+        surfaces = self._piece_surfaces
+        for sq, p in enumerate(self.board):
+            if p:
+                r, c = SQUARE_COORDS[sq]
+                self.screen.blit(surfaces[p], (c * SQ_SIZE, r * SQ_SIZE))
 
     def draw_status(self):
         # Render a small status bar at top-left using a smaller font
-        small_font = pygame.font.SysFont(self.font.get_name() if hasattr(self.font, 'get_name') else None, 20)
         msg = self.status_message if self.status_message else ('White to move.' if self.turn == WHITE else 'Black to move.')
-        text = small_font.render(msg, True, TEXT_COLOR)
-        self.screen.blit(text, (8, 8))
+        if self._status_surface is None or self._status_surface[0] != msg:
+            self._status_surface = (msg, self._status_font.render(msg, True, TEXT_COLOR))
+        self.screen.blit(self._status_surface[1], (8, 8))
 
     # =========================
     # Main Loop
@@ -475,28 +849,26 @@ class ChessGame:
                     running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     self.handle_click(event.pos)
+                elif event.type in REDRAW_EVENTS:
+                    self._dirty = True
+
+            # AI Move (Black), once the player's move is on screen since the search blocks
+            if not self.game_over and self.turn == BLACK and not self._dirty:
+                mv = self.ai_choose_move()
+                if mv is None:
+                    # No legal moves: checkmate or stalemate
+                    self._update_status_after_move()
+                else:
+                    self._apply_move(mv)
+                    self._update_status_after_move()
 
-            # AI Move (Black)
-            if not self.game_over and self.turn == BLACK:
-                now = pygame.time.get_ticks()
-                if self._ai_move_due_at is None:
-                    self._ai_move_due_at = now + self.ai_delay_ms
-                if now >= self._ai_move_due_at:
-                    mv = self.ai_choose_move()
-                    if mv is None:
-                        # No legal moves: checkmate or stalemate
-                        self._update_status_after_move()
-                    else:
-                        self.board = self.make_move_on_board(self.board, mv)
-                        self.turn = WHITE
-                        self._ai_move_due_at = None
-                        self._update_status_after_move()
-
-            # Draw
-            self.draw_board()
-            self.draw_pieces()
-            self.draw_status()
-            pygame.display.flip()
+            # Draw only when something changed
+            if self._dirty:
+                self.draw_board()
+                self.draw_pieces()
+                self.draw_status()
+                pygame.display.flip()
+                self._dirty = False
 
         pygame.quit()
         sys.exit()